@@ -1,13 +1,198 @@
+import hashlib
+import weakref
+
 import numpy as np
 import scipy.sparse as sp
+from scipy.sparse.linalg import LinearOperator
 from discretize.utils import Zero
 from ..simulation import BaseSimulation
 from .. import props
 from scipy.constants import mu_0
 import properties
 
+# numba is a soft dependency for SimPEG
+try:
+    from numba import njit, prange, get_num_threads
+except ImportError:
+    njit = None
+
+#: Number of stored values above which the compiled sparse products are used.
+_NUMBA_MIN_NNZ = 100_000
+
+if njit is not None:
+
+    @njit(parallel=True, fastmath=True, boundscheck=False, cache=True)
+    def _csr_matvec(data, indices, indptr, x, out):
+        for i in prange(indptr.shape[0] - 1):
+            acc = out[i]
+            for jj in range(indptr[i], indptr[i + 1]):
+                acc += data[jj] * x[indices[jj]]
+            out[i] = acc
+
+
+def _sparse_matvec(M, x, adjoint=False):
+    """
+    ``M @ x``, or ``M.T @ x`` if adjoint, for a 1D x.
+
+    Large products that gather along the rows of a CSR layout (``M @ x`` for
+    CSR, ``M.T @ x`` for CSC) go through a multithreaded numba kernel when
+    numba is available with more than one thread. Everything else, including
+    the scattering ``M.T @ x`` of a CSR matrix, uses the matrix's own product.
+    """
+    if sp.issparse(M) and M.format == "csc":
+        # the transpose of a CSC matrix is a CSR view of the same arrays
+        M = M.T
+        adjoint = not adjoint
+    if (
+        adjoint
+        or njit is None
+        or not sp.issparse(M)
+        or M.format != "csr"
+        or M.nnz < _NUMBA_MIN_NNZ
+        or get_num_threads() < 2
+    ):
+        return M.T @ x if adjoint else M @ x
+    x = np.ascontiguousarray(x)
+    out = np.zeros(M.shape[0], dtype=np.result_type(M.dtype, x.dtype))
+    _csr_matvec(M.data, M.indices, M.indptr, x, out)
+    return out
+
+
+def _diag_csr(vec):
+    """Construct a diagonal CSR matrix directly from its diagonal vector."""
+    vec = np.asarray(vec)
+    n = vec.size
+    return sp.csr_matrix(
+        (vec, np.arange(n, dtype=np.int32), np.arange(n + 1, dtype=np.int32)),
+        shape=(n, n),
+        copy=False,
+    )
+
+
+def _diagonal_inverse(M):
+    """Return the inverse of M as a diagonal CSR matrix, or None if M is not diagonal."""
+    n = M.shape[0]
+    if M.shape[1] != n or M.nnz != n:
+        return None
+    M = M.tocsr()
+    if np.any(np.diff(M.indptr) != 1) or np.any(M.indices != np.arange(n)):
+        return None
+    return _diag_csr(1.0 / M.data)
+
+
+def _scale_rows(A, w):
+    """Return diag(w) @ A as a new CSR matrix, without a sparse product."""
+    A = sp.csr_matrix(A, dtype=np.result_type(A.dtype, w.dtype), copy=True)
+    A.data *= np.repeat(w, np.diff(A.indptr))
+    return A
+
+
+def _scale_columns(A, w):
+    """Return A @ diag(w) as a new CSR matrix, without a sparse product."""
+    A = sp.csr_matrix(A, dtype=np.result_type(A.dtype, w.dtype), copy=True)
+    A.data *= w[A.indices]
+    return A
+
+
+class _ScaledProductOperator(LinearOperator):
+    """
+    Lazily applied ``L @ diag(w) @ R``, or its transpose.
+
+    Only the factors are kept, so no sparse product is formed for
+    matrix-vector products. ``L`` may be ``None`` for a row scaling of ``R``.
+    The explicit matrix is assembled (and kept) by ``tocsr`` on request.
+    """
+
+    def __init__(self, w, R, L=None, transposed=False):
+        self.w = w
+        self.R = R
+        self.L = L
+        self.transposed = transposed
+        self._csr = None
+        shape = (R.shape[0] if L is None else L.shape[0], R.shape[1])
+        if transposed:
+            shape = shape[::-1]
+        super().__init__(dtype=np.result_type(w.dtype, R.dtype), shape=shape)
+
+    def _matmat(self, x):
+        w = self.w[:, None] if x.ndim > 1 else self.w
+        if self.transposed:
+            if self.L is not None:
+                x = self.L.T @ x
+            return self.R.T @ (w * x)
+        y = w * (self.R @ x)
+        if self.L is not None:
+            y = self.L @ y
+        return y
+
+    def _matvec(self, x):
+        return self._matmat(x)
+
+    def _transpose(self):
+        return _ScaledProductOperator(
+            self.w, self.R, L=self.L, transposed=not self.transposed
+        )
+
+    # the factors are real valued, so the adjoint is the transpose
+    _adjoint = _transpose
+
+    def tocsr(self):
+        if self._csr is None:
+            if self.L is None:
+                M = _scale_rows(self.R, self.w)
+            else:
+                M = sp.csr_matrix(_scale_columns(self.L, self.w) @ self.R)
+            if self.transposed:
+                M = M.T.tocsr()
+            self._csr = M
+        return self._csr
+
+
+#: Inner products of fixed (unmapped) properties built on each mesh, keyed by
+#: the mesh itself so that the entries are dropped when the mesh is garbage
+#: collected. The matrices are only held weakly, so an entry also goes away
+#: once no simulation stashes it anymore.
+_INNER_PRODUCT_CACHE = weakref.WeakKeyDictionary()
+
+
+def _cached_inner_product(mesh, location, model, invert_matrix=False, shared=False):
+    """
+    Face ("F") or edge ("E") inner product matrix of mesh for a model.
+
+    With shared, simulations on the same mesh with the same property value
+    share the same matrix, which must then not be modified in place. This
+    only pays off for properties that do not change with the model.
+    """
+    if shared:
+        model_arr = np.ascontiguousarray(model)
+        key = (
+            location,
+            invert_matrix,
+            model_arr.shape,
+            model_arr.dtype.str,
+            hashlib.blake2b(model_arr.tobytes(), digest_size=16).digest(),
+        )
+        cache = _INNER_PRODUCT_CACHE.get(mesh)
+        if cache is None:
+            cache = _INNER_PRODUCT_CACHE[mesh] = weakref.WeakValueDictionary()
+        M = cache.get(key)
+        if M is not None:
+            return M
+    if location == "F":
+        M = mesh.get_face_inner_product(model=model, invert_matrix=invert_matrix)
+    else:
+        M = mesh.get_edge_inner_product(model=model, invert_matrix=invert_matrix)
+    if shared:
+        cache[key] = M
+    return M
+
 
 def __inner_mat_mul_op(M, u, v=None, adjoint=False):
+    # fast path for the common single field, single vector case
+    if v is not None and getattr(u, "ndim", 0) == 1 and getattr(v, "ndim", 0) == 1:
+        if adjoint:
+            return _sparse_matvec(M, u * v, adjoint=True)
+        return u * _sparse_matvec(M, v)
     u = np.squeeze(u)
     if v is not None:
         v = np.squeeze(v)
@@ -28,10 +213,27 @@ def __inner_mat_mul_op(M, u, v=None, adjoint=False):
             return np.squeeze(u[:, None, :] * (M * v)[:, :, None])
         return u * (M * v)
     else:
+        if isinstance(M, _ScaledProductOperator):
+            M = M.tocsr()
         if u.ndim > 1:
-            UM = sp.vstack([sp.diags(u[:, i]) @ M for i in range(u.shape[1])])
+            # stack diag(u[:, i]) @ M for every field by scaling the rows of a
+            # single CSR copy of M, instead of building and vstacking k products
+            M = sp.csr_matrix(M)
+            n_fields = u.shape[1]
+            nnz = M.nnz
+            rows = np.repeat(np.arange(M.shape[0]), np.diff(M.indptr))
+            data = (u[rows, :] * M.data[:, None]).reshape(-1, order="F")
+            indices = np.tile(M.indices, n_fields)
+            indptr = np.r_[
+                (M.indptr[:-1] + nnz * np.arange(n_fields)[:, None]).reshape(-1),
+                nnz * n_fields,
+            ]
+            UM = sp.csr_matrix(
+                (data, indices, indptr),
+                shape=(M.shape[0] * n_fields, M.shape[1]),
+            )
         else:
-            U = sp.diags(u, format="csr")
+            U = _diag_csr(u)
             UM = U @ M
         if adjoint:
             return UM.T
@@ -59,17 +261,47 @@ def with_property_mass_matrices(property_name):
         arg = property_name.lower()
         arg = arg[0].upper() + arg[1:]
 
+        @property
+        def _cached_prop(self):
+            """
+            Property value, evaluated once for all of the mass matrix builders.
+            """
+            stash_name = f"__{arg.lower()}"
+            prop = self.__dict__.get(stash_name)
+            if prop is None:
+                prop = getattr(self, arg.lower())
+                self.__dict__[stash_name] = prop
+            return prop
+
+        setattr(cls, f"_cached_{arg.lower()}", _cached_prop)
+
+        @property
+        def _node_weight_prop(self):
+            """
+            Property weighted cell volumes averaged to the nodes.
+            """
+            stash_name = f"_Mn_{arg}_weight"
+            w = self.__dict__.get(stash_name)
+            if w is None:
+                prop = getattr(self, f"_cached_{arg.lower()}")
+                w = self._aveN2CC_T * (self._cell_volumes * prop)
+                self.__dict__[stash_name] = w
+            return w
+
+        setattr(cls, f"_node_weight_{arg.lower()}", _node_weight_prop)
+
         @property
         def Mcc_prop(self):
             """
             Cell center property inner product matrix.
             """
             stash_name = f"_Mcc_{arg}"
-            if getattr(self, stash_name, None) is None:
-                prop = getattr(self, arg.lower())
-                M_prop = sp.diags(self.mesh.cell_volumes * prop, format="csr")
-                setattr(self, stash_name, M_prop)
-            return getattr(self, stash_name)
+            M_prop = self.__dict__.get(stash_name)
+            if M_prop is None:
+                prop = getattr(self, f"_cached_{arg.lower()}")
+                M_prop = _diag_csr(self._cell_volumes * prop)
+                self.__dict__[stash_name] = M_prop
+            return M_prop
 
         setattr(cls, f"Mcc{arg}", Mcc_prop)
 
@@ -79,12 +311,12 @@ def with_property_mass_matrices(property_name):
             Node property inner product matrix.
             """
             stash_name = f"_Mn_{arg}"
-            if getattr(self, stash_name, None) is None:
-                prop = getattr(self, arg.lower())
-                vol = self.mesh.cell_volumes
-                M_prop = sp.diags(self.mesh.aveN2CC.T * (vol * prop), format="csr")
-                setattr(self, stash_name, M_prop)
-            return getattr(self, stash_name)
+            M_prop = self.__dict__.get(stash_name)
+            if M_prop is None:
+                w = getattr(self, f"_node_weight_{arg.lower()}")
+                M_prop = _diag_csr(w.copy())
+                self.__dict__[stash_name] = M_prop
+            return M_prop
 
         setattr(cls, f"Mn{arg}", Mn_prop)
 
@@ -94,11 +326,17 @@ def with_property_mass_matrices(property_name):
             Face property inner product matrix.
             """
             stash_name = f"_Mf_{arg}"
-            if getattr(self, stash_name, None) is None:
-                prop = getattr(self, arg.lower())
-                M_prop = self.mesh.get_face_inner_product(model=prop)
-                setattr(self, stash_name, M_prop)
-            return getattr(self, stash_name)
+            M_prop = self.__dict__.get(stash_name)
+            if M_prop is None:
+                prop = getattr(self, f"_cached_{arg.lower()}")
+                M_prop = _cached_inner_product(
+                    self.mesh,
+                    "F",
+                    prop,
+                    shared=getattr(self, f"{arg.lower()}Map") is None,
+                )
+                self.__dict__[stash_name] = M_prop
+            return M_prop
 
         setattr(cls, f"Mf{arg}", Mf_prop)
 
@@ -108,11 +346,17 @@ def with_property_mass_matrices(property_name):
             Edge property inner product matrix.
             """
             stash_name = f"_Me_{arg}"
-            if getattr(self, stash_name, None) is None:
-                prop = getattr(self, arg.lower())
-                M_prop = self.mesh.get_edge_inner_product(model=prop)
-                setattr(self, stash_name, M_prop)
-            return getattr(self, stash_name)
+            M_prop = self.__dict__.get(stash_name)
+            if M_prop is None:
+                prop = getattr(self, f"_cached_{arg.lower()}")
+                M_prop = _cached_inner_product(
+                    self.mesh,
+                    "E",
+                    prop,
+                    shared=getattr(self, f"{arg.lower()}Map") is None,
+                )
+                self.__dict__[stash_name] = M_prop
+            return M_prop
 
         setattr(cls, f"Me{arg}", Me_prop)
 
@@ -122,11 +366,13 @@ def with_property_mass_matrices(property_name):
             Cell center property inner product inverse matrix.
             """
             stash_name = f"_MccI_{arg}"
-            if getattr(self, stash_name, None) is None:
-                prop = getattr(self, arg.lower())
-                M_prop = sp.diags(1.0 / (self.mesh.cell_volumes * prop), format="csr")
-                setattr(self, stash_name, M_prop)
-            return getattr(self, stash_name)
+            M_prop = self.__dict__.get(stash_name)
+            if M_prop is None:
+                # invert the (diagonal) forward matrix rather than rebuilding it
+                M = getattr(self, f"Mcc{arg}")
+                M_prop = _diag_csr(1.0 / M.diagonal())
+                self.__dict__[stash_name] = M_prop
+            return M_prop
 
         setattr(cls, f"Mcc{arg}I", MccI_prop)
 
@@ -136,14 +382,12 @@ def with_property_mass_matrices(property_name):
             Node property inner product inverse matrix.
             """
             stash_name = f"_MnI_{arg}"
-            if getattr(self, stash_name, None) is None:
-                prop = getattr(self, arg.lower())
-                vol = self.mesh.cell_volumes
-                M_prop = sp.diags(
-                    1.0 / (self.mesh.aveN2CC.T * (vol * prop)), format="csr"
-                )
-                setattr(self, stash_name, M_prop)
-            return getattr(self, stash_name)
+            M_prop = self.__dict__.get(stash_name)
+            if M_prop is None:
+                w = getattr(self, f"_node_weight_{arg.lower()}")
+                M_prop = _diag_csr(1.0 / w)
+                self.__dict__[stash_name] = M_prop
+            return M_prop
 
         setattr(cls, f"Mn{arg}I", MnI_prop)
 
@@ -153,13 +397,22 @@ def with_property_mass_matrices(property_name):
             Face property inner product inverse matrix.
             """
             stash_name = f"_MfI_{arg}"
-            if getattr(self, stash_name, None) is None:
-                prop = getattr(self, arg.lower())
-                M_prop = self.mesh.get_face_inner_product(
-                    model=prop, invert_matrix=True
-                )
-                setattr(self, stash_name, M_prop)
-            return getattr(self, stash_name)
+            M_prop = self.__dict__.get(stash_name)
+            if M_prop is None:
+                # orthogonal meshes give a diagonal inner product, which can be
+                # inverted pointwise from the (cached) forward matrix
+                M_prop = _diagonal_inverse(getattr(self, f"Mf{arg}"))
+                if M_prop is None:
+                    prop = getattr(self, f"_cached_{arg.lower()}")
+                    M_prop = _cached_inner_product(
+                        self.mesh,
+                        "F",
+                        prop,
+                        invert_matrix=True,
+                        shared=getattr(self, f"{arg.lower()}Map") is None,
+                    )
+                self.__dict__[stash_name] = M_prop
+            return M_prop
 
         setattr(cls, f"Mf{arg}I", MfI_prop)
 
@@ -169,13 +422,22 @@ def with_property_mass_matrices(property_name):
             Edge property inner product inverse matrix.
             """
             stash_name = f"_MeI_{arg}"
-            if getattr(self, stash_name, None) is None:
-                prop = getattr(self, arg.lower())
-                M_prop = self.mesh.get_edge_inner_product(
-                    model=prop, invert_matrix=True
-                )
-                setattr(self, stash_name, M_prop)
-            return getattr(self, stash_name)
+            M_prop = self.__dict__.get(stash_name)
+            if M_prop is None:
+                # orthogonal meshes give a diagonal inner product, which can be
+                # inverted pointwise from the (cached) forward matrix
+                M_prop = _diagonal_inverse(getattr(self, f"Me{arg}"))
+                if M_prop is None:
+                    prop = getattr(self, f"_cached_{arg.lower()}")
+                    M_prop = _cached_inner_product(
+                        self.mesh,
+                        "E",
+                        prop,
+                        invert_matrix=True,
+                        shared=getattr(self, f"{arg.lower()}Map") is None,
+                    )
+                self.__dict__[stash_name] = M_prop
+            return M_prop
 
         setattr(cls, f"Me{arg}I", MeI_prop)
 
@@ -188,15 +450,14 @@ def with_property_mass_matrices(property_name):
             if isinstance(u, Zero) or isinstance(v, Zero):
                 return Zero()
             stash_name = f"_Mcc_{arg}_deriv"
-
-            if getattr(self, stash_name, None) is None:
-                M_prop_deriv = sp.diags(self.mesh.cell_volumes) * getattr(
-                    self, f"{arg.lower()}Deriv"
+            M_prop_deriv = self.__dict__.get(stash_name)
+            if M_prop_deriv is None:
+                # kept as a lazy operator, all uses only need its products
+                M_prop_deriv = _ScaledProductOperator(
+                    self._cell_volumes, getattr(self, f"{arg.lower()}Deriv")
                 )
-                setattr(self, stash_name, M_prop_deriv)
-            return __inner_mat_mul_op(
-                getattr(self, stash_name), u, v=v, adjoint=adjoint
-            )
+                self.__dict__[stash_name] = M_prop_deriv
+            return __inner_mat_mul_op(M_prop_deriv, u, v=v, adjoint=adjoint)
 
         setattr(cls, f"Mcc{arg}Deriv", MccDeriv_prop)
 
@@ -209,16 +470,16 @@ def with_property_mass_matrices(property_name):
             if isinstance(u, Zero) or isinstance(v, Zero):
                 return Zero()
             stash_name = f"_Mn_{arg}_deriv"
-            if getattr(self, stash_name, None) is None:
-                M_prop_deriv = (
-                    self.mesh.aveN2CC.T
-                    * sp.diags(self.mesh.cell_volumes)
-                    * getattr(self, f"{arg.lower()}Deriv")
+            M_prop_deriv = self.__dict__.get(stash_name)
+            if M_prop_deriv is None:
+                # kept as a lazy operator, all uses only need its products
+                M_prop_deriv = _ScaledProductOperator(
+                    self._cell_volumes,
+                    getattr(self, f"{arg.lower()}Deriv"),
+                    L=self._aveN2CC_T,
                 )
-                setattr(self, stash_name, M_prop_deriv)
-            return __inner_mat_mul_op(
-                getattr(self, stash_name), u, v=v, adjoint=adjoint
-            )
+                self.__dict__[stash_name] = M_prop_deriv
+            return __inner_mat_mul_op(M_prop_deriv, u, v=v, adjoint=adjoint)
 
         setattr(cls, f"Mn{arg}Deriv", MnDeriv_prop)
 
@@ -231,14 +492,13 @@ def with_property_mass_matrices(property_name):
             if isinstance(u, Zero) or isinstance(v, Zero):
                 return Zero()
             stash_name = f"_Mf_{arg}_deriv"
-            if getattr(self, stash_name, None) is None:
+            M_prop_deriv = self.__dict__.get(stash_name)
+            if M_prop_deriv is None:
                 M_prop_deriv = self.mesh.get_face_inner_product_deriv(
-                    np.ones(self.mesh.n_cells)
-                )(np.ones(self.mesh.n_faces)) * getattr(self, f"{arg.lower()}Deriv")
-                setattr(self, stash_name, M_prop_deriv)
-            return __inner_mat_mul_op(
-                getattr(self, stash_name), u, v=v, adjoint=adjoint
-            )
+                    self._ones("cells")
+                )(self._ones("faces")) * getattr(self, f"{arg.lower()}Deriv")
+                self.__dict__[stash_name] = M_prop_deriv
+            return __inner_mat_mul_op(M_prop_deriv, u, v=v, adjoint=adjoint)
 
         setattr(cls, f"Mf{arg}Deriv", MfDeriv_prop)
 
@@ -251,14 +511,13 @@ def with_property_mass_matrices(property_name):
             if isinstance(u, Zero) or isinstance(v, Zero):
                 return Zero()
             stash_name = f"_Me_{arg}_deriv"
-            if getattr(self, stash_name, None) is None:
+            M_prop_deriv = self.__dict__.get(stash_name)
+            if M_prop_deriv is None:
                 M_prop_deriv = self.mesh.get_edge_inner_product_deriv(
-                    np.ones(self.mesh.n_cells)
-                )(np.ones(self.mesh.n_edges)) * getattr(self, f"{arg.lower()}Deriv")
-                setattr(self, stash_name, M_prop_deriv)
-            return __inner_mat_mul_op(
-                getattr(self, stash_name), u, v=v, adjoint=adjoint
-            )
+                    self._ones("cells")
+                )(self._ones("edges")) * getattr(self, f"{arg.lower()}Deriv")
+                self.__dict__[stash_name] = M_prop_deriv
+            return __inner_mat_mul_op(M_prop_deriv, u, v=v, adjoint=adjoint)
 
         setattr(cls, f"Me{arg}Deriv", MeDeriv_prop)
 
@@ -271,8 +530,16 @@ def with_property_mass_matrices(property_name):
             if isinstance(u, Zero) or isinstance(v, Zero):
                 return Zero()
 
-            MI_prop = getattr(self, f"Mcc{arg}I")
-            u = MI_prop @ (MI_prop @ -u)
+            # MI is diagonal, so MI @ (MI @ -u) is a single elementwise scaling
+            stash_name = f"_MccI_{arg}_sq"
+            d_sq = self.__dict__.get(stash_name)
+            if d_sq is None:
+                d = getattr(self, f"Mcc{arg}I").diagonal()
+                d_sq = np.multiply(d, d, out=d)
+                self.__dict__[stash_name] = d_sq
+            if u.ndim > 1:
+                d_sq = d_sq[:, None]
+            u = -d_sq * u
             M_prop_deriv = getattr(self, f"Mcc{arg}Deriv")
             return M_prop_deriv(u, v, adjoint=adjoint)
 
@@ -287,8 +554,15 @@ def with_property_mass_matrices(property_name):
             if isinstance(u, Zero) or isinstance(v, Zero):
                 return Zero()
 
-            MI_prop = getattr(self, f"Mn{arg}I")
-            u = MI_prop @ (MI_prop @ -u)
+            # MI is diagonal, so MI @ (MI @ -u) is a single elementwise scaling
+            stash_name = f"_MnI_{arg}_sq"
+            d_sq = self.__dict__.get(stash_name)
+            if d_sq is None:
+                d_sq = getattr(self, f"_node_weight_{arg.lower()}") ** -2
+                self.__dict__[stash_name] = d_sq
+            if u.ndim > 1:
+                d_sq = d_sq[:, None]
+            u = -d_sq * u
             M_prop_deriv = getattr(self, f"Mn{arg}Deriv")
             return M_prop_deriv(u, v, adjoint=adjoint)
 
@@ -326,25 +600,27 @@ def with_property_mass_matrices(property_name):
 
         setattr(cls, f"Me{arg}IDeriv", MeIDeriv_prop)
 
-        @property
-        def _clear_on_prop_update(self):
-            items = [
-                f"_Mcc_{arg}",
-                f"_Mn_{arg}",
-                f"_Mf_{arg}",
-                f"_Me_{arg}",
-                f"_MccI_{arg}",
-                f"_MnI_{arg}",
-                f"_MfI_{arg}",
-                f"_MeI_{arg}",
-                f"_Mcc_{arg}_deriv",
-                f"_Mn_{arg}_deriv",
-                f"_Mf_{arg}_deriv",
-                f"_Me_{arg}_deriv",
-            ]
-            return items
-
-        setattr(cls, f"_clear_on_{arg.lower()}_update", _clear_on_prop_update)
+        # the names are fixed for each property, so build them once here
+        # rather than on every model update
+        clear_on_prop_update = [
+            f"__{arg.lower()}",
+            f"_Mcc_{arg}",
+            f"_Mn_{arg}",
+            f"_Mf_{arg}",
+            f"_Me_{arg}",
+            f"_MccI_{arg}",
+            f"_MnI_{arg}",
+            f"_MfI_{arg}",
+            f"_MeI_{arg}",
+            f"_MccI_{arg}_sq",
+            f"_MnI_{arg}_sq",
+            f"_Mn_{arg}_weight",
+            f"_Mcc_{arg}_deriv",
+            f"_Mn_{arg}_deriv",
+            f"_Mf_{arg}_deriv",
+            f"_Me_{arg}_deriv",
+        ]
+        setattr(cls, f"_clear_on_{arg.lower()}_update", clear_on_prop_update)
         return cls
 
     return decorator
@@ -355,76 +631,203 @@ class BasePDESimulation(BaseSimulation):
     def Vol(self):
         return self.Mcc
 
+    @property
+    def _cell_volumes(self):
+        """
+        Cell volumes of the mesh, fetched once per mesh.
+        """
+        stash_name = "__cell_volumes"
+        value = self.__dict__.get(stash_name)
+        if value is None:
+            value = self.mesh.cell_volumes
+            self.__dict__[stash_name] = value
+        return value
+
+    def _ones(self, location):
+        """
+        Read-only vector of ones on the cells, faces or edges, kept per mesh.
+        """
+        stash_name = f"__ones_{location}"
+        value = self.__dict__.get(stash_name)
+        if value is None:
+            value = np.ones(getattr(self.mesh, f"n_{location}"))
+            value.flags.writeable = False
+            self.__dict__[stash_name] = value
+        return value
+
+    @property
+    def _aveN2CC_T(self):
+        """
+        Transpose of the node to cell center averaging operator, stored as CSR.
+        """
+        stash_name = "__aveN2CC_T"
+        value = self.__dict__.get(stash_name)
+        if value is None:
+            value = self.mesh.aveN2CC.T.tocsr()
+            self.__dict__[stash_name] = value
+        return value
+
+    @property
+    def _node_weight_unscaled(self):
+        """
+        Cell volumes averaged to the nodes, the diagonal of `Mn`.
+        """
+        stash_name = "__node_weight"
+        value = self.__dict__.get(stash_name)
+        if value is None:
+            value = self._aveN2CC_T * self._cell_volumes
+            self.__dict__[stash_name] = value
+        return value
+
+    # These items are deleted if the mesh is changed, along with the items of
+    # every other `_clear_on_*_update` list
+    _clear_on_mesh_update = [
+        "__cell_volumes",
+        "__aveN2CC_T",
+        "__node_weight",
+        "__ones_cells",
+        "__ones_faces",
+        "__ones_edges",
+        "_Mcc",
+        "_Mn",
+        "_Mf",
+        "_Me",
+        "_MccI",
+        "_MnI",
+        "_MfI",
+        "_MeI",
+    ]
+
+    def _clear_set(self, *attrs):
+        """
+        Union of the named `_clear_on_*_update` lists.
+
+        Lists defined as plain class attributes are joined once per class.
+        Subclasses may still extend them with a property, in which case the
+        names are looked up on the simulation every time.
+        """
+        cls = type(self)
+        cache = cls.__dict__.get("_clear_set_cache")
+        if cache is None:
+            cache = {}
+            setattr(cls, "_clear_set_cache", cache)
+        names = cache.get(attrs)
+        if names is None:
+            names = frozenset().union(*(getattr(self, attr) for attr in attrs))
+            if all(isinstance(getattr(cls, attr), (list, tuple)) for attr in attrs):
+                cache[attrs] = names
+        return names
+
+    def _clear_stashes(self, names):
+        """
+        Drop the named cached items that are present on the simulation.
+        """
+        # the stashes are plain instance attributes, so intersect the names with
+        # the instance dictionary and delete only the ones that are present
+        d = self.__dict__
+        for name in d.keys() & names:
+            del d[name]
+
+    @properties.observer("mesh")
+    def _clear_on_mesh_change(self, change):
+        if change["previous"] is change["value"]:
+            return
+        # all of the mass matrices, with or without a property, depend on the mesh
+        lists = [
+            name
+            for name in dir(type(self))
+            if name.startswith("_clear_on_") and name.endswith("_update")
+        ]
+        self._clear_stashes(self._clear_set(*sorted(lists)))
+
     @property
     def Mcc(self):
         """
         Cell center inner product matrix.
         """
-        if getattr(self, "_Mcc", None) is None:
-            self._Mcc = sp.diags(self.mesh.cell_volumes, format="csr")
-        return self._Mcc
+        M = self.__dict__.get("_Mcc")
+        if M is None:
+            M = _diag_csr(self._cell_volumes.copy())
+            self.__dict__["_Mcc"] = M
+        return M
 
     @property
     def Mn(self):
         """
         Node inner product matrix.
         """
-        if getattr(self, "_Mn", None) is None:
-            vol = self.mesh.cell_volumes
-            self._Mn = sp.diags(self.mesh.aveN2CC.T * vol, format="csr")
-        return self._Mn
+        M = self.__dict__.get("_Mn")
+        if M is None:
+            M = _diag_csr(self._node_weight_unscaled.copy())
+            self.__dict__["_Mn"] = M
+        return M
 
     @property
     def Mf(self):
         """
         Face inner product matrix.
         """
-        if getattr(self, "_Mf", None) is None:
-            self._Mf = self.mesh.get_face_inner_product()
-        return self._Mf
+        M = self.__dict__.get("_Mf")
+        if M is None:
+            M = self.mesh.get_face_inner_product()
+            self.__dict__["_Mf"] = M
+        return M
 
     @property
     def Me(self):
         """
         Edge inner product matrix.
         """
-        if getattr(self, "_Me", None) is None:
-            self._Me = self.mesh.get_edge_inner_product()
-        return self._Me
+        M = self.__dict__.get("_Me")
+        if M is None:
+            M = self.mesh.get_edge_inner_product()
+            self.__dict__["_Me"] = M
+        return M
 
     @property
     def MccI(self):
-        if getattr(self, "_MccI", None) is None:
-            self._MccI = sp.diags(1.0 / self.mesh.cell_volumes, format="csr")
-        return self._MccI
+        M = self.__dict__.get("_MccI")
+        if M is None:
+            M = _diag_csr(1.0 / self.Mcc.diagonal())
+            self.__dict__["_MccI"] = M
+        return M
 
     @property
     def MnI(self):
         """
         Node inner product inverse matrix.
         """
-        if getattr(self, "_MnI", None) is None:
-            vol = self.mesh.cell_volumes
-            self._MnI = sp.diags(1.0 / (self.mesh.aveN2CC.T * vol), format="csr")
-        return self._MnI
+        M = self.__dict__.get("_MnI")
+        if M is None:
+            M = _diag_csr(1.0 / self._node_weight_unscaled)
+            self.__dict__["_MnI"] = M
+        return M
 
     @property
     def MfI(self):
         """
         Face inner product inverse matrix.
         """
-        if getattr(self, "_MfI", None) is None:
-            self._MfI = self.mesh.get_face_inner_product(invert_matrix=True)
-        return self._MfI
+        M = self.__dict__.get("_MfI")
+        if M is None:
+            M = _diagonal_inverse(self.Mf)
+            if M is None:
+                M = self.mesh.get_face_inner_product(invert_matrix=True)
+            self.__dict__["_MfI"] = M
+        return M
 
     @property
     def MeI(self):
         """
         Edge inner product inverse matrix.
         """
-        if getattr(self, "_MeI", None) is None:
-            self._MeI = self.mesh.get_edge_inner_product(invert_matrix=True)
-        return self._MeI
+        M = self.__dict__.get("_MeI")
+        if M is None:
+            M = _diagonal_inverse(self.Me)
+            if M is None:
+                M = self.mesh.get_edge_inner_product(invert_matrix=True)
+            self.__dict__["_MeI"] = M
+        return M
 
 
 @with_property_mass_matrices("sigma")
@@ -460,9 +863,9 @@ class BaseElectricalPDESimulation(BasePDESimulation):
             and np.allclose(change["previous"], change["value"])
         ):
             return
-        for mat in self._clear_on_sigma_update + self._clear_on_rho_update:
-            if hasattr(self, mat):
-                delattr(self, mat)
+        self._clear_stashes(
+            self._clear_set("_clear_on_sigma_update", "_clear_on_rho_update")
+        )
 
     @properties.observer("rho")
     def _clear_mats_on_rho_update(self, change):
@@ -474,9 +877,9 @@ class BaseElectricalPDESimulation(BasePDESimulation):
             and np.allclose(change["previous"], change["value"])
         ):
             return
-        for mat in self._clear_on_sigma_update + self._clear_on_rho_update:
-            if hasattr(self, mat):
-                delattr(self, mat)
+        self._clear_stashes(
+            self._clear_set("_clear_on_sigma_update", "_clear_on_rho_update")
+        )
 
 
 @with_property_mass_matrices("mu")
@@ -510,9 +913,9 @@ class BaseMagneticPDESimulation(BasePDESimulation):
             and np.allclose(change["previous"], change["value"])
         ):
             return
-        for mat in self._clear_on_mu_update + self._clear_on_mui_update:
-            if hasattr(self, mat):
-                delattr(self, mat)
+        self._clear_stashes(
+            self._clear_set("_clear_on_mu_update", "_clear_on_mui_update")
+        )
 
     @properties.observer("mui")
     def _clear_mats_on_mui_update(self, change):
@@ -524,6 +927,6 @@ class BaseMagneticPDESimulation(BasePDESimulation):
             and np.allclose(change["previous"], change["value"])
         ):
             return
-        for mat in self._clear_on_mu_update + self._clear_on_mui_update:
-            if hasattr(self, mat):
-                delattr(self, mat)
+        self._clear_stashes(
+            self._clear_set("_clear_on_mu_update", "_clear_on_mui_update")
+        )
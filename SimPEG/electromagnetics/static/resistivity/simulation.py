@@ -6,6 +6,7 @@ from ....utils import mkvc, Zero
 from ....data import Data
 from ....base import BaseElectricalPDESimulation
 from .survey import Survey
+from .sources import _project_sources
 from .fields import Fields3DCellCentered, Fields3DNodal
 from .utils import _mini_pole_pole
 from discretize.utils import make_boundary_bool
@@ -215,6 +216,9 @@ class BaseDCSimulation(BaseElectricalPDESimulation):
 
         q = np.zeros((n, len(Srcs)), order="F")
 
+        # project the electrodes of all of the sources onto the mesh together
+        _project_sources(Srcs, self)
+
         for i, source in enumerate(Srcs):
             q[:, i] = source.eval(self)
         return q
@@ -556,13 +560,8 @@ class Simulation3DNodal(BaseDCSimulation):
         # return qDeriv
         return Zero()
 
-    @property
-    def _clear_on_sigma_update(self):
-        """
-        These matrices are deleted if there is an update to the conductivity
-        model
-        """
-        return super()._clear_on_sigma_update + ["_MBC_sigma"]
+    # These matrices are deleted if there is an update to the conductivity model
+    _clear_on_sigma_update = BaseDCSimulation._clear_on_sigma_update + ["_MBC_sigma"]
 
 
 Simulation3DCellCentred = Simulation3DCellCentered  # UK and US!
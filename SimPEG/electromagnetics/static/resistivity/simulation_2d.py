@@ -9,6 +9,7 @@ from ....base import BaseElectricalPDESimulation
 from ....data import Data
 
 from .survey import Survey
+from .sources import _project_sources
 from .fields_2d import Fields2D, Fields2DCellCentered, Fields2DNodal
 from .fields import FieldsDC, Fields3DCellCentered, Fields3DNodal
 from .utils import _mini_pole_pole
@@ -338,6 +339,9 @@ class BaseDCSimulation2D(BaseElectricalPDESimulation):
 
         q = np.zeros((n, len(Srcs)), order="F")
 
+        # project the electrodes of all of the sources onto the mesh together
+        _project_sources(Srcs, self)
+
         for i, src in enumerate(Srcs):
             q[:, i] = src.eval(self)
         return q
@@ -1,19 +1,94 @@
+import hashlib
+import os
+import weakref
+from functools import lru_cache
+
 import numpy as np
 import properties
+import scipy.sparse as sp
 
 from .... import survey
 from ....utils import Zero
 
+try:
+    from joblib import Memory
+except ImportError:
+    Memory = None
+
+# Source vectors can also be kept on disk, across sessions, by pointing the
+# SIMPEG_SRC_CACHE environment variable at a directory (requires joblib).
+if Memory is not None and os.environ.get("SIMPEG_SRC_CACHE"):
+    _Q_DISK_CACHE = Memory(location=os.environ["SIMPEG_SRC_CACHE"], verbose=0)
+else:
+    _Q_DISK_CACHE = None
+
+_MESH_HASHES = weakref.WeakKeyDictionary()
+
+
+def _mesh_hash(mesh):
+    """Digest of the mesh geometry, computed once per mesh"""
+    digest = _MESH_HASHES.get(mesh)
+    if digest is None:
+        h = hashlib.blake2b(type(mesh).__name__.encode(), digest_size=16)
+        h.update(np.ascontiguousarray(mesh.cell_centers).tobytes())
+        h.update(np.ascontiguousarray(mesh.nodes).tobytes())
+        digest = h.hexdigest()
+        _MESH_HASHES[mesh] = digest
+    return digest
+
+
+@lru_cache(maxsize=8)
+def _nan_location(shape):
+    """Shared, read-only array of NaNs for the missing B electrode"""
+    loc = np.full(shape, np.nan)
+    loc.setflags(write=False)
+    return loc
+
+
+def _project(locations, mesh, formulation):
+    """
+    Projection of electrode locations onto the mesh, as the closest cell
+    indices (HJ) or the nodal interpolation matrix (EB).
+    """
+    if formulation == "HJ":
+        return np.asarray(mesh.closest_points_index(locations, grid_loc="CC"))
+    elif formulation == "EB":
+        return mesh.get_interpolation_matrix(locations, locType="N").tocsr()
+
+
+def _source_vector(mesh, formulation, locations, current, projection=None):
+    """Sparse single column source vector of the electrodes and their currents"""
+    if projection is None:
+        projection = _project(locations, mesh, formulation)
+    cur = np.broadcast_to(current, locations.shape[:1])
+    if formulation == "HJ":
+        # a later electrode in the same cell overrides an earlier one
+        inds, last = np.unique(projection[::-1], return_index=True)
+        return sp.csc_matrix(
+            (cur[::-1][last], (inds, np.zeros_like(inds))), shape=(mesh.nC, 1)
+        )
+    elif formulation == "EB":
+        return sp.csc_matrix(projection.T @ sp.csc_matrix(cur[:, None]))
+
+
+def _disk_source_vector(mesh_hash, mesh, formulation, locations, current):
+    # the mesh itself is identified by mesh_hash in the disk cache key
+    return _source_vector(mesh, formulation, locations, current)
+
+
+if _Q_DISK_CACHE is not None:
+    _disk_source_vector = _Q_DISK_CACHE.cache(_disk_source_vector, ignore=["mesh"])
+
 
 class BaseSrc(survey.BaseSrc):
     """
     Base DC source
     """
 
-    _q = None
-
     def __init__(self, receiver_list, location, current=1.0, **kwargs):
         super().__init__(receiver_list=receiver_list, **kwargs)
+        # source vectors, keyed on the mesh and then on the formulation
+        self._q_cache = weakref.WeakKeyDictionary()
         self.location = location
         self.current = current
 
@@ -27,6 +102,7 @@ class BaseSrc(survey.BaseSrc):
         other = np.asarray(other, dtype=float)
         other = np.atleast_2d(other)
         self._location = other
+        self._invalidate_q()
 
     @property
     def current(self):
@@ -44,29 +120,94 @@ class BaseSrc(survey.BaseSrc):
                 f" saw {len(other)} current sources and {self.location.shape[0]} locations."
             )
         self._current = other
+        self._invalidate_q()
+
+    def __getstate__(self):
+        # the per-mesh source vectors are rebuilt on demand, and the weak
+        # references to the meshes cannot be pickled
+        state = self.__dict__.copy()
+        state.pop("_q_cache", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._q_cache = weakref.WeakKeyDictionary()
+
+    def _invalidate_q(self):
+        """Drop the stored source vectors"""
+        q_cache = getattr(self, "_q_cache", None)
+        if q_cache is not None:
+            q_cache.clear()
+
+    def _cached_q(self, sim):
+        """Stored source vector for the simulation, or None"""
+        mesh_cache = self._q_cache.get(sim.mesh)
+        if mesh_cache is None:
+            return None
+        return mesh_cache.get(sim._formulation)
+
+    def _store_q(self, sim, q):
+        mesh_cache = self._q_cache.get(sim.mesh)
+        if mesh_cache is None:
+            mesh_cache = {}
+            self._q_cache[sim.mesh] = mesh_cache
+        mesh_cache[sim._formulation] = q
+
+    def _q_sparse(self, sim):
+        """Source vector for the simulation, as a sparse single column matrix"""
+        q = self._cached_q(sim)
+        if q is None:
+            if _Q_DISK_CACHE is not None:
+                q = _disk_source_vector(
+                    _mesh_hash(sim.mesh),
+                    sim.mesh,
+                    sim._formulation,
+                    self.location,
+                    self.current,
+                )
+            else:
+                q = _source_vector(
+                    sim.mesh, sim._formulation, self.location, self.current
+                )
+            self._store_q(sim, q)
+        return q
 
     def eval(self, sim):
-        if self._q is not None:
-            return self._q
-        else:
-            if sim._formulation == "HJ":
-                inds = sim.mesh.closest_points_index(self.location, grid_loc="CC")
-                self._q = np.zeros(sim.mesh.nC)
-                self._q[inds] = self.current
-            elif sim._formulation == "EB":
-                loc = self.location
-                cur = self.current
-                interpolation_matrix = sim.mesh.get_interpolation_matrix(
-                    loc, locType="N"
-                ).toarray()
-                q = np.sum(cur[:, np.newaxis] * interpolation_matrix, axis=0)
-                self._q = q
-            return self._q
+        return self._q_sparse(sim).toarray()[:, 0]
 
     def evalDeriv(self, sim):
         return Zero()
 
 
+def _project_sources(source_list, sim):
+    """
+    Build the missing source vectors of the DC sources in `source_list` on
+    the simulation's mesh, projecting all of their electrodes at once.
+    """
+    todo = [
+        src
+        for src in source_list
+        if isinstance(src, BaseSrc) and src._cached_q(sim) is None
+    ]
+    # with the disk cache enabled, each source is looked up on its own
+    if len(todo) == 0 or _Q_DISK_CACHE is not None:
+        return
+    n_locs = [src.location.shape[0] for src in todo]
+    projection = _project(
+        np.vstack([src.location for src in todo]), sim.mesh, sim._formulation
+    )
+    stops = np.cumsum(n_locs)
+    for src, start, stop in zip(todo, stops - n_locs, stops):
+        q = _source_vector(
+            sim.mesh,
+            sim._formulation,
+            src.location,
+            src.current,
+            projection=projection[start:stop],
+        )
+        src._store_q(sim, q)
+
+
 class Multipole(BaseSrc):
     """
     Generic Multipole Source
@@ -80,7 +221,7 @@ class Multipole(BaseSrc):
     @property
     def location_b(self):
         """Location of the B electrode"""
-        return np.full_like(self.location, np.nan)
+        return _nan_location(self.location.shape)
 
 
 class Dipole(BaseSrc):
@@ -163,4 +304,4 @@ class Pole(BaseSrc):
     @property
     def location_b(self):
         """Location of the B electrode"""
-        return np.full_like(self.location[0], np.nan)
+        return _nan_location(self.location[0].shape)
@@ -1,3 +1,6 @@
+import numpy as np
+import scipy.sparse as sp
+
 from ...survey import BaseSurvey
 
 
@@ -32,28 +35,31 @@ class Survey(BaseSurvey):
         return self.source_field.receiver_list[0].components
 
     @property
-    def Qfx(self):
-        if getattr(self, "_Qfx", None) is None:
-            self._Qfx = self.prob.mesh.getInterpolationMat(
-                self.receiver_locations, "Fx"
+    def Qf(self):
+        """
+        Stacked projection of the x, y and z face fields to the receivers
+        """
+        if getattr(self, "_Qf", None) is None:
+            self._Qf = sp.vstack(
+                [
+                    self.prob.mesh.getInterpolationMat(self.receiver_locations, loc)
+                    for loc in ["Fx", "Fy", "Fz"]
+                ],
+                format="csr",
             )
-        return self._Qfx
+        return self._Qf
+
+    @property
+    def Qfx(self):
+        return self.Qf[: self.nRx]
 
     @property
     def Qfy(self):
-        if getattr(self, "_Qfy", None) is None:
-            self._Qfy = self.prob.mesh.getInterpolationMat(
-                self.receiver_locations, "Fy"
-            )
-        return self._Qfy
+        return self.Qf[self.nRx : 2 * self.nRx]
 
     @property
     def Qfz(self):
-        if getattr(self, "_Qfz", None) is None:
-            self._Qfz = self.prob.mesh.getInterpolationMat(
-                self.receiver_locations, "Fz"
-            )
-        return self._Qfz
+        return self.Qf[2 * self.nRx :]
 
     def projectFields(self, u):
         """
@@ -74,9 +80,8 @@ class Survey(BaseSurvey):
         """
         # TODO: There can be some different tyes of data like |B| or B
 
-        gfx = self.Qfx * u["G"]
-        gfy = self.Qfy * u["G"]
-        gfz = self.Qfz * u["G"]
+        # project all three components with a single product
+        gfx, gfy, gfz = np.split(self.Qf * u["G"], 3)
 
         fields = {"gx": gfx, "gy": gfy, "gz": gfz}
         return fields
@@ -189,8 +189,12 @@ class BaseSrc(BaseSimPEG):
     @properties.validator("receiver_list")
     def _receiver_list_validator(self, change):
         value = change["value"]
-        assert len(set(value)) == len(value), "The receiver_list must be unique"
+        # check uniqueness on the receiver ids while building their order
         self._rxOrder = dict()
+        for ii, rx in enumerate(value):
+            if rx._uid in self._rxOrder:
+                raise ValueError("The receiver_list must be unique")
+            self._rxOrder[rx._uid] = ii
 
     def getReceiverIndex(self, receiver):
         if not isinstance(receiver, list):
@@ -209,12 +213,12 @@ class BaseSrc(BaseSimPEG):
     @property
     def nD(self):
         """Number of data"""
-        return sum(self.vnD)
+        return int(self.vnD.sum())
 
     @property
     def vnD(self):
         """Vector number of data"""
-        return np.array([rx.nD for rx in self.receiver_list])
+        return np.array([rx.nD for rx in self.receiver_list], dtype=int)
 
     def __init__(self, receiver_list=None, location=None, **kwargs):
         super(BaseSrc, self).__init__(**kwargs)
@@ -250,6 +254,7 @@ class BaseSurvey(properties.HasProperties):
         if len(set(value)) != len(value):
             raise Exception("The source_list must be unique")
         self._sourceOrder = dict()
+        self._vnD = None
         ii = 0
         for src in value:
             n_fields = src._fields_per_source
@@ -277,7 +282,7 @@ class BaseSurvey(properties.HasProperties):
     @property
     def nD(self):
         """Number of data"""
-        return sum(self.vnD)
+        return int(self.vnD.sum())
 
     @property
     def vnD(self):
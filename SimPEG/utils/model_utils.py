@@ -8,6 +8,15 @@ from scipy.spatial import cKDTree
 import scipy.sparse as sp
 
 
+def _tree_query(tree, points):
+    """Nearest neighbour query of a cKDTree, spread over all of the cores"""
+    try:
+        return tree.query(points, workers=-1)
+    except TypeError:
+        # scipy < 1.6 has no workers argument
+        return tree.query(points)
+
+
 def surface2ind_topo(mesh, topo, gridLoc="CC", method="nearest", fill_value=np.nan):
     """
     Get active indices from topography
@@ -233,30 +242,29 @@ def surface_layer_index(mesh, topo, index=0):
     # Get cdkTree to find top layer
     tree = cKDTree(mesh.gridCC)
 
-    def ismember(a, b):
-        bind = {}
-        for i, elt in enumerate(b):
-            if elt not in bind:
-                bind[elt] = i
-        return np.vstack([bind.get(itm, None) for itm in a])
-
     grid_x, grid_y = np.meshgrid(mesh.vectorCCx, mesh.vectorCCy)
     zInterp = mkvc(
         griddata(topo[:, :2], topo[:, 2], (grid_x, grid_y), method="nearest")
     )
 
     # Get nearest cells
-    r, inds = tree.query(np.c_[mkvc(grid_x), mkvc(grid_y), zInterp])
+    r, inds = _tree_query(tree, np.c_[mkvc(grid_x), mkvc(grid_y), zInterp])
     inds = np.unique(inds)
 
     # Extract vertical neighbors from Gradz operator
     Dz = mesh._cellGradzStencil
     Iz, Jz, _ = sp.find(Dz)
     jz = np.sort(Jz[np.argsort(Iz)].reshape((int(Iz.shape[0] / 2), 2)), axis=1)
-    for ii in range(index):
 
-        members = ismember(inds, jz[:, 1])
-        inds = np.squeeze(jz[members, 0])
+    # sort the pairs on the upper cell once, so the cell below each member of
+    # inds can be looked up with a vectorized binary search
+    jz = jz[np.argsort(jz[:, 1], kind="stable")]
+    upper = jz[:, 1]
+    for ii in range(index):
+        pos = np.searchsorted(upper, inds)
+        found = pos < len(upper)
+        found[found] = upper[pos[found]] == inds[found]
+        inds = jz[pos[found], 0]
 
     actv[inds] = True
 
@@ -300,6 +308,8 @@ def depth_weighting(mesh, reference_locs, indActive=None, exponent=2.0, threshol
     When ``reference_locs`` is an array of values, the difference is between the
     nearest point (of first two dimensions) in ``reference_locs``.
     'exponent' and 'threshold' are two adjustable parameters.
+
+    The cell centers and ``reference_locs`` are expected to be finite.
     """
 
     # Default threshold value
@@ -308,24 +318,26 @@ def depth_weighting(mesh, reference_locs, indActive=None, exponent=2.0, threshol
 
     reference_locs = np.asarray(reference_locs)
 
+    # Only the active cells are weighted
+    cell_centers = mesh.cell_centers
+    if indActive is not None:
+        cell_centers = cell_centers[indActive]
+
     # Calculate depth from receiver locations, delta_z
     # reference_locs is a scalar
     if reference_locs.ndim < 2:
-        delta_z = np.abs(mesh.cell_centers[:, -1] - reference_locs)
+        delta_z = np.abs(cell_centers[:, -1] - reference_locs)
 
     # reference_locs is a 2d array
     elif reference_locs.ndim == 2:
 
         tree = cKDTree(reference_locs[:, :-1])
-        _, ind = tree.query(mesh.cell_centers[:, :-1])
-        delta_z = np.abs(mesh.cell_centers[:, -1] - reference_locs[ind, -1])
+        _, ind = _tree_query(tree, cell_centers[:, :-1])
+        delta_z = np.abs(cell_centers[:, -1] - reference_locs[ind, -1])
 
     else:
         raise ValueError("reference_locs must be either a scalar or 2d array!")
 
     wz = (delta_z + threshold) ** (-0.5 * exponent)
 
-    if indActive is not None:
-        wz = wz[indActive]
-
-    return wz / np.nanmax(wz)
+    return wz / wz.max()
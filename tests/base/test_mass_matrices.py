@@ -1,8 +1,15 @@
-from SimPEG.base import with_property_mass_matrices, BasePDESimulation
+from SimPEG.base import (
+    with_property_mass_matrices,
+    BasePDESimulation,
+    BaseElectricalPDESimulation,
+)
+from SimPEG.base import pde_simulation
 from SimPEG import props, maps
 import unittest
+from unittest import mock
 import discretize
 import numpy as np
+import scipy.sparse as sp
 from scipy.constants import mu_0
 from discretize.tests import check_derivative
 from discretize.utils import Zero
@@ -531,3 +538,150 @@ class TestSim(unittest.TestCase):
         yJv = y @ sim.MfSigmaIDeriv(u, v)
         vJty = v @ sim.MfSigmaIDeriv(u, y, adjoint=True)
         np.testing.assert_allclose(yJv, vJty)
+
+    def test_Mcc_Mn_deriv_operators(self):
+        sim = self.sim
+        sim.model = self.start_mod
+
+        n_c = self.mesh.n_cells
+        n_n = self.mesh.n_nodes
+        v = np.random.randn(n_c)
+        v2 = np.random.randn(n_c, 3)
+
+        for deriv, n_items in [
+            (sim.MccSigmaDeriv, n_c),
+            (sim.MnSigmaDeriv, n_n),
+        ]:
+            u = np.random.rand(n_items)
+            u2 = np.random.rand(n_items, 2)
+            y = np.random.randn(n_items)
+            y2 = np.random.randn(n_items, 2)
+
+            # explicit operators agree with the lazily applied products
+            UM = deriv(u)
+            np.testing.assert_allclose(UM @ v, deriv(u, v))
+            np.testing.assert_allclose(UM @ v2, deriv(u, v2))
+            UMT = deriv(u, adjoint=True)
+            np.testing.assert_allclose(UMT @ y, deriv(u, y, adjoint=True))
+
+            UM = deriv(u2)
+            np.testing.assert_allclose(UM @ v, deriv(u2, v).reshape(-1, order="F"))
+            UMT = deriv(u2, adjoint=True)
+            np.testing.assert_allclose(
+                UMT @ y2.reshape(-1, order="F"), deriv(u2, y2, adjoint=True)
+            )
+
+
+class TestSharedInnerProducts(unittest.TestCase):
+    def setUp(self):
+        self.mesh = discretize.TensorMesh([5, 6, 7])
+        self.sigma = np.random.rand(self.mesh.n_cells)
+
+    def test_shared_between_simulations(self):
+        sim1 = BaseElectricalPDESimulation(self.mesh, sigma=self.sigma)
+        sim2 = BaseElectricalPDESimulation(self.mesh, sigma=self.sigma.copy())
+        self.assertIs(sim1.MfSigma, sim2.MfSigma)
+        self.assertIs(sim1.MeSigma, sim2.MeSigma)
+
+        sim2.sigma = 2 * self.sigma
+        self.assertIsNot(sim1.MfSigma, sim2.MfSigma)
+        np.testing.assert_allclose(sim2.MfSigma.toarray(), 2 * sim1.MfSigma.toarray())
+
+    def test_not_shared_with_map(self):
+        model = np.log(self.sigma)
+        sim1 = BaseElectricalPDESimulation(
+            self.mesh, sigmaMap=maps.ExpMap(), model=model
+        )
+        sim2 = BaseElectricalPDESimulation(
+            self.mesh, sigmaMap=maps.ExpMap(), model=model
+        )
+        self.assertIsNot(sim1.MfSigma, sim2.MfSigma)
+        self.assertNotIn(self.mesh, pde_simulation._INNER_PRODUCT_CACHE)
+
+    def test_superseded_entries_dropped(self):
+        sim = BaseElectricalPDESimulation(self.mesh, sigma=self.sigma)
+        for i in range(3):
+            sim.sigma = (i + 1) * self.sigma
+            sim.MfSigma
+        self.assertEqual(len(pde_simulation._INNER_PRODUCT_CACHE[self.mesh]), 1)
+        del sim
+        self.assertEqual(len(pde_simulation._INNER_PRODUCT_CACHE[self.mesh]), 0)
+
+
+class TestClearOnUpdate(unittest.TestCase):
+    def test_property_clear_list(self):
+        class PropertySim(BaseElectricalPDESimulation):
+            @property
+            def _clear_on_sigma_update(self):
+                return super()._clear_on_sigma_update + ["_extra"]
+
+        mesh = discretize.TensorMesh([3, 4, 5])
+        sim = PropertySim(mesh, sigma=np.ones(mesh.n_cells))
+        for sigma in [2.0, 3.0]:
+            sim.MfSigma
+            sim._extra = 1.0
+            sim.sigma = sigma * np.ones(mesh.n_cells)
+            self.assertNotIn("_Mf_Sigma", sim.__dict__)
+            self.assertNotIn("_extra", sim.__dict__)
+        np.testing.assert_allclose(sim.MccSigma.diagonal(), 3 * mesh.cell_volumes)
+
+    def test_mesh_change(self):
+        mesh = discretize.TensorMesh([3, 4, 5])
+        sim = BaseElectricalPDESimulation(mesh, sigma=2.0)
+        locs = ["cc", "n", "f", "e"]
+        names = [
+            f"M{loc}{prop}{inv}"
+            for loc in locs
+            for prop in ["", "Sigma"]
+            for inv in ["", "I"]
+        ]
+        for name in names:
+            getattr(sim, name)
+        ones = sim._ones("faces")
+        self.assertFalse(ones.flags.writeable)
+        self.assertIs(sim._ones("faces"), ones)
+
+        mesh2 = discretize.TensorMesh([4, 4, 4])
+        sim.mesh = mesh2
+        sizes = {
+            "cc": mesh2.n_cells,
+            "n": mesh2.n_nodes,
+            "f": mesh2.n_faces,
+            "e": mesh2.n_edges,
+        }
+        for name in names:
+            n = sizes[name[1:].replace("Sigma", "").rstrip("I")]
+            self.assertEqual(getattr(sim, name).shape, (n, n))
+        np.testing.assert_allclose(sim.MccSigma.diagonal(), 2 * mesh2.cell_volumes)
+        self.assertEqual(sim._ones("faces").shape, (mesh2.n_faces,))
+
+
+@unittest.skipIf(pde_simulation.njit is None, "numba is not installed")
+class TestCompiledProducts(unittest.TestCase):
+    def test_csr_kernel(self):
+        M = sp.random(60, 40, density=0.2, format="csr")
+        x = np.random.randn(40) + 1j * np.random.randn(40)
+
+        out = np.zeros(60, dtype=complex)
+        pde_simulation._csr_matvec(M.data, M.indices, M.indptr, x, out)
+        np.testing.assert_allclose(out, M @ x)
+
+    def test_sparse_matvec_dispatch(self):
+        rng = np.random.RandomState(0)
+        A = sp.random(60, 40, density=0.2, format="csr", random_state=rng)
+        x = {False: rng.randn(40), True: rng.randn(60)}
+        kernel = mock.Mock(wraps=pde_simulation._csr_matvec)
+        # pretend to have several threads, so that the kernel is used here too
+        with mock.patch.object(pde_simulation, "_NUMBA_MIN_NNZ", 0), mock.patch.object(
+            pde_simulation, "get_num_threads", return_value=4
+        ), mock.patch.object(pde_simulation, "_csr_matvec", kernel):
+            for M in [A, A.tocsc(), A + 1j * A, (A + 1j * A).tocsc()]:
+                for adjoint in [False, True]:
+                    for v in [x[adjoint], x[adjoint] * (1 - 2j)]:
+                        kernel.reset_mock()
+                        expected = M.T @ v if adjoint else M @ v
+                        out = pde_simulation._sparse_matvec(M, v, adjoint=adjoint)
+                        self.assertEqual(out.dtype, expected.dtype)
+                        np.testing.assert_allclose(out, expected)
+                        # only row gathers are compiled, CSR adjoints use scipy
+                        self.assertEqual(kernel.called, (M.format == "csc") == adjoint)
@@ -9,6 +9,7 @@ from SimPEG import (
     maps,
     utils,
 )
+from SimPEG.utils.model_utils import surface_layer_index
 
 
 class DepthWeightingTest(unittest.TestCase):
@@ -74,5 +75,25 @@ class DepthWeightingTest(unittest.TestCase):
         np.testing.assert_allclose(wz, wz2)
 
 
+class SurfaceLayerIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.mesh = TensorMesh([np.ones(4), np.ones(4), np.ones(6)])
+        x = np.linspace(-1.0, 5.0, 7)
+        X, Y = np.meshgrid(x, x)
+        # flat topography in the cells centered at z = 4.5
+        self.topo = np.c_[X.ravel(), Y.ravel(), np.full(X.size, 4.4)]
+
+    def test_layers(self):
+        z = self.mesh.cell_centers[:, 2]
+        for index in range(5):
+            actv = surface_layer_index(self.mesh, self.topo, index=index)
+            np.testing.assert_array_equal(actv, z == 4.5 - index)
+
+    def test_below_bottom(self):
+        actv = surface_layer_index(self.mesh, self.topo, index=5)
+        self.assertEqual(actv.shape, (self.mesh.n_cells,))
+        self.assertFalse(actv.any())
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -76,5 +76,29 @@ class TestData(unittest.TestCase):
         )
 
 
+class TestReceiverList(unittest.TestCase):
+    def test_receiver_index(self):
+        XYZ = utils.ndgrid(np.linspace(5, 10, 3), np.r_[0.0], np.r_[0.0])
+        rxs = [survey.BaseRx(XYZ) for _ in range(3)]
+        src = survey.BaseSrc(rxs)
+        self.assertEqual(src.getReceiverIndex(rxs[::-1]), [2, 1, 0])
+        self.assertEqual(src.nD, 9)
+
+    def test_nD_follows_receivers(self):
+        rx = survey.BaseRx(np.zeros((2, 3)))
+        src = survey.BaseSrc([rx])
+        self.assertEqual(src.nD, 2)
+        rx.locations = np.zeros((5, 3))
+        self.assertEqual(src.nD, 5)
+        src.receiver_list.append(survey.BaseRx(np.zeros((3, 3))))
+        self.assertEqual(src.nD, 8)
+        self.assertEqual(src.vnD.tolist(), [5, 3])
+
+    def test_unique_receivers(self):
+        rx = survey.BaseRx(np.zeros((1, 3)))
+        with self.assertRaises(ValueError):
+            survey.BaseSrc([rx, rx])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,134 @@
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+from numpy.testing import assert_array_almost_equal
+import discretize
+
+from SimPEG.electromagnetics.static import resistivity as dc
+from SimPEG.electromagnetics.static.resistivity import sources
+
+
+class TestDipoleSourceVector(unittest.TestCase):
+    def setUp(self):
+        self.mesh = discretize.TensorMesh([np.ones(10)] * 3, origin="CCC")
+        self.src = dc.sources.Dipole(
+            [], location_a=[-2.0, 0.0, 0.0], location_b=[2.0, 0.0, 0.0]
+        )
+        survey = dc.Survey([self.src])
+        self.sim_nodal = dc.Simulation3DNodal(self.mesh, survey=survey)
+        self.sim_cc = dc.Simulation3DCellCentered(self.mesh, survey=survey)
+
+    def test_cached_per_formulation(self):
+        q_n = self.src.eval(self.sim_nodal)
+        q_cc = self.src.eval(self.sim_cc)
+        self.assertEqual(q_n.shape[0], self.mesh.n_nodes)
+        self.assertEqual(q_cc.shape[0], self.mesh.n_cells)
+        self.assertIs(
+            self.src._q_sparse(self.sim_nodal), self.src._q_sparse(self.sim_nodal)
+        )
+        self.assertIs(self.src._q_sparse(self.sim_cc), self.src._q_sparse(self.sim_cc))
+        assert_array_almost_equal(q_n.sum(), 0.0)
+        self.assertEqual(q_cc[q_cc != 0].tolist(), [1.0, -1.0])
+
+    def test_cached_per_mesh(self):
+        q = self.src._q_sparse(self.sim_nodal)
+        mesh2 = discretize.TensorMesh([np.ones(8)] * 3, origin="CCC")
+        sim2 = dc.Simulation3DNodal(mesh2, survey=dc.Survey([self.src]))
+        q2 = self.src.eval(sim2)
+        self.assertEqual(q2.shape[0], mesh2.n_nodes)
+        self.assertIs(self.src._q_sparse(self.sim_nodal), q)
+
+    def test_sparse_storage(self):
+        q = self.src._q_sparse(self.sim_nodal)
+        self.assertEqual(q.shape, (self.mesh.n_nodes, 1))
+        self.assertLessEqual(q.nnz, 16)
+        self.assertIsInstance(self.src.eval(self.sim_nodal), np.ndarray)
+
+    def test_invalidated_on_update(self):
+        q = self.src.eval(self.sim_nodal)
+        self.src.current = [2.0, -2.0]
+        assert_array_almost_equal(self.src.eval(self.sim_nodal), 2 * q)
+
+        self.src.location = [[-3.0, 0.0, 0.0], [3.0, 0.0, 0.0]]
+        P = self.mesh.get_interpolation_matrix(self.src.location, "N")
+        assert_array_almost_equal(self.src.eval(self.sim_nodal), P.T @ self.src.current)
+
+    def test_pickle(self):
+        for _ in range(2):
+            src = pickle.loads(pickle.dumps(self.src))
+            assert_array_almost_equal(src.location_a, self.src.location_a)
+            self.assertIsNone(src._cached_q(self.sim_nodal))
+            sim = pickle.loads(pickle.dumps(self.sim_nodal))
+            assert_array_almost_equal(
+                sim.survey.source_list[0].eval(sim), self.src.eval(self.sim_nodal)
+            )
+            # again, with the source vectors stored
+            self.sim_nodal.getSourceTerm()
+
+
+class TestBatchedSourceProjection(unittest.TestCase):
+    def test_matches_individual(self):
+        mesh = discretize.TensorMesh([np.ones(10)] * 3, origin="CCC")
+        locs = np.random.RandomState(2).uniform(-4, 4, size=(6, 3))
+        for sim_class in [dc.Simulation3DNodal, dc.Simulation3DCellCentered]:
+            srcs = [
+                dc.sources.Dipole([], locs[0], locs[1]),
+                dc.sources.Pole([], locs[2]),
+                dc.sources.Multipole([], locs[3:], current=[1.0, 0.5, -1.5]),
+            ]
+            sim = sim_class(mesh, survey=dc.Survey(srcs))
+            q = sim.getSourceTerm()
+            for i, src in enumerate(srcs):
+                src._invalidate_q()
+                assert_array_almost_equal(q[:, i], src.eval(sim))
+
+
+@unittest.skipIf(sources.Memory is None, "joblib is not installed")
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        memory = sources.Memory(location=tmpdir.name, verbose=0)
+        self.project = mock.Mock(wraps=sources._project)
+        for patch in [
+            mock.patch.object(sources, "_Q_DISK_CACHE", memory),
+            mock.patch.object(
+                sources,
+                "_disk_source_vector",
+                memory.cache(sources._disk_source_vector, ignore=["mesh"]),
+            ),
+            mock.patch.object(sources, "_project", self.project),
+        ]:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def get_q(self, mesh, current=1.0):
+        src = dc.sources.Dipole(
+            [], location_a=[-2.0, 0.0, 0.0], location_b=[2.0, 0.0, 0.0]
+        )
+        src.current = current
+        sim = dc.Simulation3DNodal(mesh, survey=dc.Survey([src]))
+        return sim.getSourceTerm()[:, 0]
+
+    def test_shared_between_equal_meshes(self):
+        q = self.get_q(discretize.TensorMesh([np.ones(10)] * 3, origin="CCC"))
+        self.assertEqual(self.project.call_count, 1)
+
+        # an equal but distinct mesh reads the stored vector back
+        mesh = discretize.TensorMesh([np.ones(10)] * 3, origin="CCC")
+        assert_array_almost_equal(self.get_q(mesh), q)
+        self.assertEqual(self.project.call_count, 1)
+
+        # while a different mesh or current is projected again
+        q2 = self.get_q(discretize.TensorMesh([np.ones(8)] * 3, origin="CCC"))
+        self.assertEqual(self.project.call_count, 2)
+        self.assertNotEqual(q2.shape, q.shape)
+        assert_array_almost_equal(self.get_q(mesh, current=2.0), 2 * q)
+        self.assertEqual(self.project.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -186,5 +186,25 @@ class GravityGradientFwdProblemTests(unittest.TestCase):
         self.assertLess(err_zz, 0.005)
 
 
+class GravSurveyProjectionTests(unittest.TestCase):
+    def test_project_fields(self):
+        mesh = discretize.TensorMesh([4, 5, 6], "CCC")
+        locs = np.random.RandomState(0).uniform(-0.4, 0.4, size=(7, 3))
+        receiver = gravity.receivers.Point(locs, components=["gx", "gy", "gz"])
+        survey = gravity.survey.Survey(gravity.sources.SourceField([receiver]))
+        survey.prob = gravity.simulation.Simulation3DIntegral(
+            mesh, survey=survey, store_sensitivities="forward_only"
+        )
+        u = {"G": np.random.RandomState(1).randn(mesh.n_faces)}
+
+        fields = survey.projectFields(u)
+        for comp, loc in zip(["gx", "gy", "gz"], ["Fx", "Fy", "Fz"]):
+            P = mesh.getInterpolationMat(locs, loc)
+            np.testing.assert_allclose(fields[comp], P * u["G"])
+            np.testing.assert_allclose(
+                getattr(survey, f"Qf{comp[1]}").toarray(), P.toarray()
+            )
+
+
 if __name__ == "__main__":
     unittest.main()